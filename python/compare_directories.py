@@ -1,25 +1,29 @@
 #!/usr/bin/env python
 """
 File: compare_directories.py
-Description: This script recursively scans two directory hierarchies and compares their files by computing SHA-256 hashes.
+Description: This script recursively scans two directory hierarchies and compares their files by computing content hashes
+             (BLAKE3 when the `blake3` package is installed, SHA-256 otherwise).
              It identifies files that exist in the reference directory but not in the main directory and vice versa,
              matching files by their content (hash) rather than their names. The output is a JSON file containing statistics
              and tables showing correspondences between the two hierarchies.
 
 Usage:
-    python compare_directories.py -p <main_directory> -r <reference_directory> -o <output_json> [-v] [--threads <num_threads>]
+    python compare_directories.py -p <main_directory> -r <reference_directory> -o <output_json> [-v] [--workers <num_workers>] [--hash-algorithm <name>] [--quick]
 
 Flags:
     -p, --path       Main path to a directory whose contents will be analyzed.
     -r, --reference  Reference path to a directory to compare files with.
     -o, --output     Output JSON file path for the results.
     -v, --verbose    (Optional) Enable verbose output to stdout.
-    --threads        (Optional) Number of threads to use for concurrent file hashing. Defaults to the executor's default.
+    --workers        (Optional) Number of worker processes used for file hashing. Defaults to os.cpu_count().
+                     --threads is accepted as an alias for backwards compatibility.
+    --hash-algorithm (Optional) Content hash to use: 'blake3' (default when installed) or 'sha256'.
+    --quick          (Optional) Only fully hash files whose size and leading 4KB match a file in the other
+                     directory. Files that cannot have a counterpart are reported with a null hash.
 
 TODO:
     - Consider adding a progress bar (e.g., using tqdm) for large directory scans.
     - Implement a CSV output option for human-readable reports.
-    - Allow configurable hash algorithms (e.g., MD5, SHA-256).
     - Enhance error handling for inaccessible files or directories.
     - Explore async I/O for further performance improvements.
 """
@@ -27,34 +31,182 @@ TODO:
 import os
 import argparse
 import hashlib
+import io
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Optional, Tuple
+import mmap
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+from typing import Any, BinaryIO, Callable, Iterable, List, Dict, Optional, Tuple
 
+try:
+    from blake3 import blake3
+except ImportError:  # blake3 is optional; SHA-256 from hashlib is always available.
+    blake3 = None
 
-def compute_file_hash(file_path: str, buffer_size: int = 65536) -> Optional[str]:
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library json module is used otherwise.
+    orjson = None
+
+# Hashes are only used as content fingerprints, so the fastest available algorithm is preferred.
+HASH_ALGORITHMS: Tuple[str, ...] = ("blake3", "sha256") if blake3 is not None else ("sha256",)
+DEFAULT_HASH_ALGORITHM: str = HASH_ALGORITHMS[0]
+
+# Limits on the work handed to a worker process per task. Batches are closed by byte count so that
+# many small files share one task (amortizing pickling and IPC) while large files are spread across
+# workers; a job that fits in a single batch is hashed in-process without starting a pool at all.
+HASH_BATCH_BYTES: int = 16 * 1024 * 1024
+HASH_BATCH_MAX_FILES: int = 1024
+
+# Number of leading bytes hashed (with --quick) to split same-size files before hashing them in full.
+QUICK_HASH_BYTES: int = 4096
+
+
+def _select_hasher_factory() -> Callable[[], Any]:
+    """
+    Choose the SHA-256 constructor used for file hashing, once, at import time.
+
+    hashlib's sha256 is backed by OpenSSL, which dispatches on CPUID at runtime and uses the
+    Intel SHA extensions (SHA-NI) or AVX2 code paths when the CPU provides them, so no native
+    binding is needed to get hardware acceleration. Passing usedforsecurity=False (Python 3.9+)
+    marks the digest as a content fingerprint, which keeps it available on FIPS-restricted builds.
+
+    Returns:
+        Callable[[], Any]: A zero-argument callable returning a fresh hash object.
+    """
+    try:
+        hashlib.sha256(usedforsecurity=False)
+    except TypeError:
+        return hashlib.sha256
+    return lambda: hashlib.sha256(usedforsecurity=False)
+
+
+_new_hasher: Callable[[], Any] = _select_hasher_factory()
+
+
+def _open_for_hashing(file_path: str) -> int:
+    """
+    Open a file read-only for a single sequential pass.
+
+    On Linux, O_NOATIME is requested so hashing does not dirty inode access times. The kernel only
+    allows it for files owned by the caller, so the open is retried without it on EPERM.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        int: An open file descriptor. The caller is responsible for closing it.
+    """
+    flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+    noatime = getattr(os, 'O_NOATIME', 0)
+    if noatime:
+        try:
+            return os.open(file_path, flags | noatime)
+        except PermissionError:
+            pass
+    return os.open(file_path, flags)
+
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """
+    Give the kernel a whole-file access hint where posix_fadvise is supported.
+
+    Args:
+        fd (int): An open file descriptor.
+        advice_name (str): The name of an os.POSIX_FADV_* constant.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice_name))
+        except OSError:
+            pass
+
+
+def _update_from_mmap(hasher: Any, fd: int) -> bool:
     """
-    Compute SHA-256 hash for a given file.
+    Feed an entire file to a hasher through a read-only memory map.
 
-    This function reads the file in binary mode in chunks to efficiently handle large files.
+    The hasher reads the mapped pages directly, so no intermediate bytes objects are allocated.
+    The kernel is advised that the mapping will be read once, front to back.
+
+    Args:
+        hasher (Any): A hashlib-style object with an update() method.
+        fd (int): An open, readable file descriptor.
+
+    Returns:
+        bool: True if the file was hashed, False if it could not be mapped (e.g., empty files,
+              pipes, or platforms without mmap support) and the caller should read it instead.
+    """
+    try:
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return False
+    with mm:
+        if hasattr(mm, "madvise"):
+            # madvise() takes a single advice value per call; these are not bit flags.
+            for advice in ("MADV_SEQUENTIAL", "MADV_WILLNEED"):
+                if hasattr(mmap, advice):
+                    mm.madvise(getattr(mmap, advice))
+        hasher.update(mm)
+    return True
+
+
+def _update_from_reads(hasher: Any, fd: int, buffer_size: int) -> None:
+    """
+    Feed a file to a hasher by reading it into a single reused buffer.
+
+    Args:
+        hasher (Any): A hashlib-style object with an update() method.
+        fd (int): An open, readable file descriptor. It is not closed by this function.
+        buffer_size (int): The size (in bytes) of the read buffer.
+    """
+    buf = bytearray(buffer_size)
+    view = memoryview(buf)
+    with io.FileIO(fd, 'r', closefd=False) as f:
+        while n := f.readinto(buf):
+            hasher.update(view[:n])
+
+
+def compute_file_hash(file_path: str, buffer_size: int = 65536,
+                      algorithm: str = DEFAULT_HASH_ALGORITHM, threaded: bool = True) -> Optional[str]:
+    """
+    Compute the content hash for a given file.
+
+    For SHA-256 the file is memory-mapped and handed to the hasher in one call; files that cannot be
+    mapped (such as empty files) are read in chunks into one preallocated buffer instead. Where the
+    platform supports it, the kernel is told the file is read sequentially and its cached pages are
+    released afterwards, so scanning large trees does not flush the page cache.
+    For BLAKE3 the file is memory-mapped and hashed by the library directly, which uses the
+    widest SIMD instruction set available and, when threaded, multiple threads for large files.
 
     Args:
         file_path (str): The absolute path to the file.
         buffer_size (int, optional): The size (in bytes) of the chunk to read at a time. Defaults to 65536.
+        algorithm (str, optional): One of HASH_ALGORITHMS. Defaults to DEFAULT_HASH_ALGORITHM.
+        threaded (bool, optional): Let BLAKE3 use multiple threads for large files. Defaults to True.
 
     Returns:
-        Optional[str]: The hexadecimal SHA-256 hash of the file, or None if an error occurs.
+        Optional[str]: The hexadecimal hash of the file, or None if an error occurs.
 
     TODO:
-        - Add support for configurable hash algorithms.
         - Consider asynchronous file reading for potential performance improvements.
     """
     try:
-        hasher = hashlib.sha256()
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(buffer_size):
-                hasher.update(chunk)
+        if algorithm == "blake3":
+            hasher = blake3(max_threads=blake3.AUTO if threaded else 1)
+            hasher.update_mmap(file_path)
+        else:
+            hasher = _new_hasher()
+            fd = _open_for_hashing(file_path)
+            try:
+                _fadvise(fd, 'POSIX_FADV_SEQUENTIAL')
+                if not _update_from_mmap(hasher, fd):
+                    _update_from_reads(hasher, fd, buffer_size)
+            finally:
+                # Each file is read exactly once, so drop its pages rather than evicting hotter data.
+                _fadvise(fd, 'POSIX_FADV_DONTNEED')
+                os.close(fd)
         logging.debug(f"Computed hash for {file_path}")
         return hasher.hexdigest()
     except Exception as e:
@@ -62,73 +214,291 @@ def compute_file_hash(file_path: str, buffer_size: int = 65536) -> Optional[str]
         return None
 
 
-def scan_directory(root_path: str, verbose: bool = False) -> Dict[str, List[str]]:
+def compute_prefix_hash(file_path: str, num_bytes: int = QUICK_HASH_BYTES,
+                        algorithm: str = DEFAULT_HASH_ALGORITHM) -> Optional[str]:
     """
-    Recursively scan a directory using os.scandir(), compute hashes for each file, and build a mapping
-    from file hash to file paths.
+    Compute the content hash of the first `num_bytes` bytes of a file.
 
-    This implementation uses a recursive helper function and os.scandir() for improved performance
-    over os.walk() on large directories.
+    Used as a cheap pre-filter: files whose leading bytes differ cannot have identical content.
+
+    Args:
+        file_path (str): The absolute path to the file.
+        num_bytes (int, optional): The number of leading bytes to hash. Defaults to QUICK_HASH_BYTES.
+        algorithm (str, optional): One of HASH_ALGORITHMS. Defaults to DEFAULT_HASH_ALGORITHM.
+
+    Returns:
+        Optional[str]: The hexadecimal hash of the file's prefix, or None if an error occurs.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read(num_bytes)
+        hasher = blake3() if algorithm == "blake3" else _new_hasher()
+        hasher.update(data)
+        return hasher.hexdigest()
+    except Exception as e:
+        logging.error(f"Error computing prefix hash for file {file_path}: {e}")
+        return None
+
+
+def _hash_batch(batch: List[str], algorithm: str, prefix_bytes: Optional[int] = None,
+                threaded: bool = False) -> List[Tuple[str, Optional[str]]]:
+    """
+    Hash a batch of files inside a worker process.
+
+    Args:
+        batch (List[str]): Full paths of the files to hash.
+        algorithm (str): The hash algorithm to use.
+        prefix_bytes (Optional[int], optional): If given, only hash this many leading bytes of each file.
+        threaded (bool, optional): Let BLAKE3 use multiple threads per file. Pool workers leave this off,
+                                   since the pool already runs one process per CPU. Defaults to False.
+
+    Returns:
+        List[Tuple[str, Optional[str]]]: (full_path, file_hash) pairs; file_hash is None on failure.
+    """
+    if prefix_bytes is not None:
+        return [(path, compute_prefix_hash(path, prefix_bytes, algorithm)) for path in batch]
+    return [(path, compute_file_hash(path, algorithm=algorithm, threaded=threaded)) for path in batch]
+
+
+def _make_batches(files: Dict[str, int]) -> List[List[str]]:
+    """
+    Split files into batches of at most HASH_BATCH_MAX_FILES files and roughly HASH_BATCH_BYTES bytes.
+
+    Args:
+        files (Dict[str, int]): A mapping from full path to the number of bytes that will be hashed.
+
+    Returns:
+        List[List[str]]: The batches of full paths.
+    """
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    batch_bytes = 0
+    for path, size in files.items():
+        batch.append(path)
+        batch_bytes += size
+        if batch_bytes >= HASH_BATCH_BYTES or len(batch) >= HASH_BATCH_MAX_FILES:
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def hash_files(files: Dict[str, int], algorithm: str = DEFAULT_HASH_ALGORITHM,
+               num_workers: Optional[int] = None,
+               prefix_bytes: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Hash many files concurrently in a process pool.
+
+    Hashing runs in separate processes so the per-file Python work is not serialized by the GIL.
+    Files are submitted in size-bounded batches (see _make_batches) so each task carries enough work to
+    pay for its IPC. If everything fits in one batch, it is hashed in this process instead, since a
+    single task would not run in parallel anyway and starting the pool would cost more than the work.
+
+    Args:
+        files (Dict[str, int]): A mapping from full path to the number of bytes that will be hashed
+                                (the file size, or prefix_bytes when smaller).
+        algorithm (str, optional): The hash algorithm to use. Defaults to DEFAULT_HASH_ALGORITHM.
+        num_workers (Optional[int], optional): Number of hashing processes. Defaults to os.cpu_count().
+        prefix_bytes (Optional[int], optional): If given, only hash this many leading bytes of each file.
+
+    Returns:
+        Dict[str, Optional[str]]: A mapping from full path to hash, or to None if hashing failed.
+    """
+    hashes: Dict[str, Optional[str]] = {}
+    batches = _make_batches(files)
+    if len(batches) <= 1:
+        for batch in batches:
+            hashes.update(_hash_batch(batch, algorithm, prefix_bytes, threaded=True))
+        return hashes
+    with ProcessPoolExecutor(max_workers=num_workers or os.cpu_count()) as executor:
+        futures = [executor.submit(_hash_batch, batch, algorithm, prefix_bytes) for batch in batches]
+        for future in as_completed(futures):
+            hashes.update(future.result())
+    return hashes
+
+
+def scan_directory(root_path: str, verbose: bool = False) -> Dict[int, List[Tuple[str, str]]]:
+    """
+    Recursively scan a directory using os.scandir() and group its files by size.
+
+    The walk is iterative, using an explicit stack of pending directories, so deep hierarchies cannot hit
+    the recursion limit and no Python frame is created per directory. Entry types come from the d_type
+    returned by the directory listing, and file sizes come from a single DirEntry.stat() call per file.
 
     Args:
         root_path (str): The directory path to scan.
         verbose (bool, optional): If True, logs additional information about the scanning process. Defaults to False.
 
     Returns:
-        Dict[str, List[str]]: A dictionary where each key is a file hash and the value is a list of file paths
-                              (relative to root_path) having that hash.
+        Dict[int, List[Tuple[str, str]]]: A dictionary where each key is a file size in bytes and the value is a
+                                          list of (full_path, relative_path) pairs for the files of that size.
 
     TODO:
         - Enhance error handling for directories with permission issues.
         - Consider yielding file paths to reduce memory usage in extremely large directories.
     """
-    hash_map: Dict[str, List[str]] = {}
-    files_to_process: List[Tuple[str, str]] = []
-
-    def recursive_scan(current_path: str) -> None:
-        """
-        Recursively scan the given directory using os.scandir().
-
-        Args:
-            current_path (str): The current directory path being scanned.
-
-        TODO:
-            - Handle symlinks or special files if needed.
-        """
+    size_map: Dict[int, List[Tuple[str, str]]] = {}
+    file_count = 0
+    # Every entry path starts with root_path plus a separator, so relative paths are a plain slice.
+    prefix_len = len(os.path.join(root_path, ''))
+
+    # TODO: Handle symlinks or special files if needed.
+    stack: List[str] = [root_path]
+    while stack:
+        current_path = stack.pop()
         try:
             with os.scandir(current_path) as it:
                 for entry in it:
-                    if entry.is_file(follow_symlinks=False):
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
                         full_path = entry.path
-                        relative_path = os.path.relpath(full_path, root_path)
-                        files_to_process.append((full_path, relative_path))
-                    elif entry.is_dir(follow_symlinks=False):
-                        recursive_scan(entry.path)
+                        size = entry.stat(follow_symlinks=False).st_size
+                        size_map.setdefault(size, []).append((full_path, full_path[prefix_len:]))
+                        file_count += 1
         except Exception as e:
             logging.error(f"Error scanning directory {current_path}: {e}")
             # TODO: Handle specific errors (e.g., permission issues) more gracefully.
 
-    recursive_scan(root_path)
-
     if verbose:
-        logging.info(f"Found {len(files_to_process)} files in {root_path}")
-
-    # Use a configurable number of threads; if not provided, ThreadPoolExecutor uses its default settings.
-    num_threads: Optional[int] = None  # TODO: Allow this to be configurable via command-line argument if needed.
-    with ThreadPoolExecutor(max_workers=num_threads) as executor:
-        future_to_file = {
-            executor.submit(compute_file_hash, full_path): rel_path
-            for full_path, rel_path in files_to_process
-        }
-        for future in as_completed(future_to_file):
-            rel_path = future_to_file[future]
-            file_hash = future.result()
-            if file_hash is not None:
-                hash_map.setdefault(file_hash, []).append(rel_path)
+        logging.info(f"Found {file_count} files in {root_path}")
+    return size_map
+
+
+def filter_candidates(main_sizes: Dict[int, List[Tuple[str, str]]],
+                      ref_sizes: Dict[int, List[Tuple[str, str]]],
+                      algorithm: str = DEFAULT_HASH_ALGORITHM,
+                      num_workers: Optional[int] = None
+                      ) -> Tuple[Dict[int, List[Tuple[str, str]]], Dict[int, List[Tuple[str, str]]],
+                                 List[str], List[str]]:
+    """
+    Narrow both trees down to the files that could have an identical counterpart in the other tree.
+
+    A file can only match if some file in the other tree has the same size and, for files larger than
+    QUICK_HASH_BYTES, the same leading QUICK_HASH_BYTES bytes. Everything else is known to be unmatched
+    without reading it in full.
+
+    Args:
+        main_sizes (Dict[int, List[Tuple[str, str]]]): The size map of the main directory.
+        ref_sizes (Dict[int, List[Tuple[str, str]]]): The size map of the reference directory.
+        algorithm (str, optional): The hash algorithm to use. Defaults to DEFAULT_HASH_ALGORITHM.
+        num_workers (Optional[int], optional): Number of hashing processes. Defaults to os.cpu_count().
+
+    Returns:
+        Tuple: (main_candidates, ref_candidates, main_unmatched, ref_unmatched), where the candidates are
+               size maps (like scan_directory's) restricted to the files that still need a full hash and the
+               unmatched lists hold relative paths of files that cannot have a counterpart.
+    """
+    common_sizes = main_sizes.keys() & ref_sizes.keys()
+    main_unmatched = [rel for size, files in main_sizes.items() if size not in common_sizes for _, rel in files]
+    ref_unmatched = [rel for size, files in ref_sizes.items() if size not in common_sizes for _, rel in files]
+
+    # Files no larger than the prefix are fully covered by the full hash, so only larger ones are pre-hashed.
+    prefix_paths = {
+        full: QUICK_HASH_BYTES for size in common_sizes if size > QUICK_HASH_BYTES
+        for sizes in (main_sizes, ref_sizes) for full, _ in sizes[size]
+    }
+    prefix_hashes = hash_files(prefix_paths, algorithm, num_workers, prefix_bytes=QUICK_HASH_BYTES)
+
+    def group_by_prefix(sizes: Dict[int, List[Tuple[str, str]]]) -> Dict[Tuple[int, str], List[Tuple[str, str]]]:
+        groups: Dict[Tuple[int, str], List[Tuple[str, str]]] = {}
+        for size in common_sizes:
+            for full_path, rel_path in sizes[size]:
+                prefix = prefix_hashes.get(full_path) if size > QUICK_HASH_BYTES else ""
+                if prefix is not None:
+                    groups.setdefault((size, prefix), []).append((full_path, rel_path))
+        return groups
+
+    main_groups = group_by_prefix(main_sizes)
+    ref_groups = group_by_prefix(ref_sizes)
+
+    main_candidates: Dict[int, List[Tuple[str, str]]] = {}
+    ref_candidates: Dict[int, List[Tuple[str, str]]] = {}
+    for groups, candidates, unmatched, other in ((main_groups, main_candidates, main_unmatched, ref_groups),
+                                                 (ref_groups, ref_candidates, ref_unmatched, main_groups)):
+        for key, files in groups.items():
+            if key in other:
+                candidates.setdefault(key[0], []).extend(files)
             else:
-                if verbose:
-                    logging.warning(f"Failed to compute hash for {rel_path}")
-    return hash_map
+                unmatched.extend(rel for _, rel in files)
+    return main_candidates, ref_candidates, main_unmatched, ref_unmatched
+
+
+def group_by_hash(files: Iterable[Tuple[str, str]], hashes: Dict[str, Optional[str]],
+                  verbose: bool = False) -> Tuple[Dict[str, List[str]], int]:
+    """
+    Build a mapping from file hash to the relative paths of the files having that hash.
+
+    The number of grouped files is counted while the mapping is built, so callers never need to
+    walk the mapping again to total it.
+
+    Args:
+        files (Iterable[Tuple[str, str]]): (full_path, relative_path) pairs.
+        hashes (Dict[str, Optional[str]]): Full-path-to-hash mapping returned by hash_files.
+        verbose (bool, optional): If True, logs files whose hash could not be computed. Defaults to False.
+
+    Returns:
+        Tuple[Dict[str, List[str]], int]: A dictionary where each key is a file hash and the value is a list
+                                          of relative file paths having that hash, and the number of files in it.
+    """
+    hash_map: Dict[str, List[str]] = {}
+    file_count = 0
+    for full_path, rel_path in files:
+        file_hash = hashes.get(full_path)
+        if file_hash is not None:
+            hash_map.setdefault(file_hash, []).append(rel_path)
+            file_count += 1
+        else:
+            if verbose:
+                logging.warning(f"Failed to compute hash for {rel_path}")
+    return hash_map, file_count
+
+
+def encode_json(data: Any, indent: bool = False) -> bytes:
+    """
+    Encode data as UTF-8 JSON.
+
+    Called once per result row, so orjson is used when installed. A row it cannot encode, such as a
+    relative path with undecodable bytes (carried as lone surrogates), is encoded by the standard
+    library json module instead, which writes them as \\udcXX escapes.
+
+    Args:
+        data (Any): The JSON-serializable data to encode.
+        indent (bool, optional): If True, indent nested values by two spaces. Defaults to False.
+
+    Returns:
+        bytes: The encoded JSON document.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+def stream_json_array(out: BinaryIO, key: str, items: Iterable[Any]) -> None:
+    """
+    Write one `"key": [...]` member of a JSON object, encoding and writing the items one at a time.
+
+    Only the current item is ever held in encoded form, so arbitrarily long result lists can be written
+    without materializing them. The member is preceded by a comma; the caller writes the opening brace
+    and the first member.
+
+    Args:
+        out (BinaryIO): The output file, opened in binary mode.
+        key (str): The member name.
+        items (Iterable[Any]): The JSON-serializable array elements.
+    """
+    out.write(b',\n  ' + encode_json(key) + b': [')
+    separator = b'\n    '
+    for item in items:
+        out.write(separator + encode_json(item))
+        separator = b',\n    '
+    # An empty array stays on one line.
+    out.write(b']' if separator == b'\n    ' else b'\n  ]')
 
 
 def main() -> None:
@@ -140,7 +510,6 @@ def main() -> None:
     and outputs the results along with statistical information.
 
     TODO:
-        - Add a command-line argument to explicitly configure the thread pool size.
         - Consider adding a progress bar to visualize file processing.
         - Evaluate adding a CSV output option for different user preferences.
     """
@@ -155,8 +524,13 @@ def main() -> None:
                         help='Output JSON file to write scan results.')
     parser.add_argument('-v', '--verbose', action='store_true',
                         help='Enable verbose output.')
-    parser.add_argument('--threads', type=int, default=None,
-                        help="Number of threads to use for concurrent file hashing. Defaults to the executor's default.")
+    parser.add_argument('--workers', '--threads', dest='workers', type=int, default=None,
+                        help="Number of worker processes to use for file hashing. Defaults to os.cpu_count().")
+    parser.add_argument('--hash-algorithm', choices=HASH_ALGORITHMS, default=DEFAULT_HASH_ALGORITHM,
+                        help=f"Content hash algorithm. Defaults to {DEFAULT_HASH_ALGORITHM}.")
+    parser.add_argument('--quick', action='store_true',
+                        help="Only fully hash files that could have a counterpart in the other directory. "
+                             "Files that cannot are reported with a null hash.")
 
     args = parser.parse_args()
 
@@ -172,61 +546,71 @@ def main() -> None:
         logging.info(f"Main directory: {main_dir}")
         logging.info(f"Reference directory: {ref_dir}")
 
-    # Scan both directories and compute file hash mappings
-    main_hashes = scan_directory(main_dir, args.verbose)
-    ref_hashes = scan_directory(ref_dir, args.verbose)
-
-    # Create sets of hashes for comparison
-    main_hash_set = set(main_hashes.keys())
-    ref_hash_set = set(ref_hashes.keys())
-
-    common_hashes = main_hash_set.intersection(ref_hash_set)
-    missing_in_main = {h: ref_hashes[h] for h in ref_hash_set - main_hash_set}
-    missing_in_reference = {h: main_hashes[h] for h in main_hash_set - ref_hash_set}
-
-    # Build the results dictionary for JSON output
-    results = {
-        "stats": {
-            "total_main_files": sum(len(v) for v in main_hashes.values()),
-            "total_reference_files": sum(len(v) for v in ref_hashes.values()),
-            "unique_hashes_in_main": len(main_hashes),
-            "unique_hashes_in_reference": len(ref_hashes),
-            "common_hashes_count": len(common_hashes),
-            "missing_in_main_count": sum(len(v) for v in missing_in_main.values()),
-            "missing_in_reference_count": sum(len(v) for v in missing_in_reference.values()),
-        },
-        "common_files": [
-            {
-                "hash": h,
-                "main_files": main_hashes[h],
-                "reference_files": ref_hashes[h]
-            }
-            for h in common_hashes
-        ],
-        "missing_in_main": [
-            {
-                "hash": h,
-                "reference_files": ref_hashes[h]
-            }
-            for h in missing_in_main
-        ],
-        "missing_in_reference": [
-            {
-                "hash": h,
-                "main_files": main_hashes[h]
-            }
-            for h in missing_in_reference
-        ]
+    # Scan both directories and group their files by size
+    main_sizes = scan_directory(main_dir, args.verbose)
+    ref_sizes = scan_directory(ref_dir, args.verbose)
+
+    main_unmatched: List[str] = []
+    ref_unmatched: List[str] = []
+    if args.quick:
+        main_sizes, ref_sizes, main_unmatched, ref_unmatched = filter_candidates(
+            main_sizes, ref_sizes, args.hash_algorithm, args.workers)
+        if args.verbose:
+            logging.info(f"Skipping full hashes for {len(main_unmatched) + len(ref_unmatched)} unmatched files")
+
+    # Hash both trees in a single pass over the process pool
+    to_hash = {full: size for sizes in (main_sizes, ref_sizes)
+               for size, files in sizes.items() for full, _ in files}
+    hashes = hash_files(to_hash, args.hash_algorithm, args.workers)
+    main_hashes, main_hashed_count = group_by_hash(
+        (f for files in main_sizes.values() for f in files), hashes, args.verbose)
+    ref_hashes, ref_hashed_count = group_by_hash(
+        (f for files in ref_sizes.values() for f in files), hashes, args.verbose)
+
+    # Compare the key views directly; no intermediate copies of the hash maps are needed
+    common_hashes = main_hashes.keys() & ref_hashes.keys()
+    missing_in_main = ref_hashes.keys() - main_hashes.keys()
+    missing_in_reference = main_hashes.keys() - ref_hashes.keys()
+
+    # Every hashed file is either common or missing, so only the common groups need counting
+    common_main_count = 0
+    common_ref_count = 0
+    for h in common_hashes:
+        common_main_count += len(main_hashes[h])
+        common_ref_count += len(ref_hashes[h])
+
+    stats = {
+        "hash_algorithm": args.hash_algorithm,
+        "total_main_files": main_hashed_count + len(main_unmatched),
+        "total_reference_files": ref_hashed_count + len(ref_unmatched),
+        "unique_hashes_in_main": len(main_hashes),
+        "unique_hashes_in_reference": len(ref_hashes),
+        "common_hashes_count": len(common_hashes),
+        "missing_in_main_count": ref_hashed_count - common_ref_count + len(ref_unmatched),
+        "missing_in_reference_count": main_hashed_count - common_main_count + len(main_unmatched),
     }
 
     if args.verbose:
         logging.info("Comparison complete. Writing output JSON file.")
-        logging.debug(f"Statistics: {results['stats']}")
+        logging.debug(f"Statistics: {stats}")
 
-    # Write the results to the specified JSON output file
+    # Stream the results to the specified JSON output file, one record at a time
     try:
-        with open(args.output, 'w', encoding='utf-8') as outfile:
-            json.dump(results, outfile, indent=4)
+        with open(args.output, 'wb') as out:
+            out.write(b'{\n  "stats": ' + encode_json(stats, indent=True).replace(b'\n', b'\n  '))
+            stream_json_array(out, "common_files", (
+                {"hash": h, "main_files": main_hashes[h], "reference_files": ref_hashes[h]}
+                for h in common_hashes
+            ))
+            stream_json_array(out, "missing_in_main", chain(
+                ({"hash": h, "reference_files": ref_hashes[h]} for h in missing_in_main),
+                ({"hash": None, "reference_files": [rel]} for rel in ref_unmatched),
+            ))
+            stream_json_array(out, "missing_in_reference", chain(
+                ({"hash": h, "main_files": main_hashes[h]} for h in missing_in_reference),
+                ({"hash": None, "main_files": [rel]} for rel in main_unmatched),
+            ))
+            out.write(b'\n}\n')
         if args.verbose:
             logging.info(f"Results successfully written to {args.output}")
     except Exception as e:
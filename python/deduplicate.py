@@ -10,40 +10,220 @@ read or until a difference is detected among files. Only groups with duplicate f
 than one file per group) are written to the output JSON file.
 
 Usage:
-    python deduplicate.py -d <directory> -o <output_json_file>
+    python deduplicate.py -d <directory> -o <output_json_file> [-v]
+
+Optional accelerators:
+    xxhash, numpy and numba are used when installed. The numba kernel is compiled for a fixed
+    signature and cached on disk next to this file, so only the first run pays for compilation.
+    Set NUMBA_CACHE_DIR to a writable shared directory when the script lives on a read-only path.
 """
 
 import os
 import sys
+import errno
 import json
 import argparse
 import hashlib
-from typing import List, Dict, Tuple
+import logging
+from contextlib import ExitStack
+from io import FileIO
+from typing import Any, List, Dict, Sequence, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library json module is used otherwise.
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional; MD5 from hashlib is used otherwise.
+    xxhash = None
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; prefix comparison falls back to pure Python.
+    np = None
+
+try:
+    from numba import njit, types as nb_types
+except ImportError:  # numba is optional; NumPy (or pure Python) is used instead.
+    njit = None
 
 # Constants for initial and extended chunk sizes
 INITIAL_CHUNK_SIZE: int = 512
-EXTEND_CHUNK_SIZE: int = 512
+# Bytes read from each file per round when extending a prefix. Reads are unbuffered, so each one is
+# a single large syscall; small blocks would make the per-read overhead dominate.
+EXTEND_CHUNK_SIZE: int = 256 * 1024
+# Most files extend_common_prefix holds open at once. Larger groups are compared in batches, which
+# keeps well under the usual 1024 open-file limit.
+EXTEND_MAX_OPEN_FILES: int = 256
+# Most bytes of read buffers extend_common_prefix allocates for one batch of files; groups of large
+# files are compared in smaller batches so memory stays bounded however big the group is.
+EXTEND_BATCH_BUFFER_BYTES: int = 32 * 1024 * 1024
 
 
 def compute_checksum(file_path: str, num_bytes: int) -> str:
     """Compute a checksum of the first `num_bytes` bytes of a file.
 
+    The checksum only buckets candidates; collisions are resolved by extend_common_prefix, so
+    the fast non-cryptographic XXH3 is used when xxhash is installed, and MD5 otherwise.
+
     Args:
         file_path (str): The path to the file.
         num_bytes (int): The number of bytes to read from the start of the file.
 
     Returns:
-        str: The hexadecimal digest of the computed MD5 checksum.
+        str: The hexadecimal digest of the computed checksum, or "" if the file could not be read.
     """
-    md5 = hashlib.md5()
     try:
         with open(file_path, "rb") as f:
             data = f.read(num_bytes)
-            md5.update(data)
     except Exception as e:
         print(f"Error reading {file_path}: {e}", file=sys.stderr)
         return ""
-    return md5.hexdigest()
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.md5(data).hexdigest()
+
+
+def _common_prefix_len_py(first: Union[bytes, memoryview], others: Sequence[Union[bytes, memoryview]]) -> int:
+    """Return how many leading bytes of `first` are shared by every chunk in `others` (pure Python)."""
+    for i, current_byte in enumerate(first):
+        for other_chunk in others:
+            # If we run out of bytes in any chunk, the match ends here.
+            if i >= len(other_chunk) or other_chunk[i] != current_byte:
+                return i
+    return len(first)
+
+
+if njit is not None:
+    # An explicit signature compiles eagerly at import; with cache=True the machine code is
+    # loaded from disk on later runs instead of being recompiled. The arrays are read-only,
+    # C-contiguous views of the chunk bytes built by _common_prefix_len.
+    _U8_ROW = nb_types.Array(nb_types.uint8, 1, "C", readonly=True)
+    _U8_ROWS = nb_types.Array(nb_types.uint8, 2, "C", readonly=True)
+
+    @njit(nb_types.int64(_U8_ROW, _U8_ROWS), cache=True)
+    def _common_prefix_len_jit(first, others):
+        """Native-code scan for the first column where any row of `others` differs from `first`."""
+        for i in range(first.size):
+            b = first[i]
+            for j in range(others.shape[0]):
+                if others[j, i] != b:
+                    return i
+        return first.size
+else:
+    _common_prefix_len_jit = None
+
+
+def _common_prefix_len(chunks: Sequence[Union[bytes, memoryview]]) -> int:
+    """Return how many leading bytes are shared by every chunk.
+
+    With NumPy available, the chunks (truncated to the shortest one, which bounds the common
+    prefix) are stacked into one 2-D uint8 array. The first differing column is then found by the
+    numba kernel when it is installed, or by a vectorized comparison otherwise.
+
+    Args:
+        chunks (Sequence[Union[bytes, memoryview]]): The chunks to compare; there must be at least one.
+
+    Returns:
+        int: The length of the common prefix in bytes.
+    """
+    if np is None:
+        return _common_prefix_len_py(chunks[0], chunks[1:])
+
+    width = min(len(chunk) for chunk in chunks)
+    arr = np.frombuffer(b"".join(chunk[:width] for chunk in chunks), dtype=np.uint8)
+    arr = arr.reshape(len(chunks), width)
+    if _common_prefix_len_jit is not None:
+        return int(_common_prefix_len_jit(arr[0], arr[1:]))
+    mismatch = (arr[1:] != arr[0]).any(axis=0)
+    return int(mismatch.argmax()) if mismatch.any() else width
+
+
+def _read_chunk(path: str, f: FileIO, view: memoryview) -> memoryview:
+    """Read the next chunk of an open file into its buffer.
+
+    Unbuffered reads may return fewer bytes than asked for, so reading continues until the buffer
+    is full or the end of the file is reached.
+
+    Args:
+        path (str): The path of the file, for error reporting.
+        f (FileIO): The open unbuffered file, positioned at the chunk to read.
+        view (memoryview): The buffer to read into.
+
+    Returns:
+        memoryview: The filled part of the buffer; empty at end of file or on a read error.
+    """
+    n = 0
+    try:
+        while n < len(view):
+            got = f.readinto(view[n:])
+            if not got:
+                break
+            n += got
+    except Exception as e:
+        print(f"Error reading {path}: {e}", file=sys.stderr)
+        n = 0
+    return view[:n]
+
+
+def _extend_batch(paths: List[str], current_depth: int, limit: int) -> int:
+    """Extend the common prefix depth of a batch of files, reading no further than `limit`.
+
+    Each file is opened unbuffered and positioned once, then read sequentially into its own
+    reusable buffer, one large read per file per block. Equality and the mismatch position are
+    both taken from one comparison of the stacked blocks.
+
+    Args:
+        paths (List[str]): The file paths to compare, all held open together.
+        current_depth (int): The current number of bytes known to be identical.
+        limit (int): The depth at which to stop extending (at most the file size).
+
+    Returns:
+        int: The new common prefix length in bytes among the files, at most `limit`.
+
+    Raises:
+        OSError: With errno EMFILE when the files cannot all be open at once.
+    """
+    new_depth = current_depth
+    with ExitStack() as stack:
+        # Open every file once and position it at the current depth.
+        files = []
+        for path in paths:
+            try:
+                f = stack.enter_context(open(path, "rb", buffering=0))
+                f.seek(new_depth)
+            except OSError as e:
+                if e.errno == errno.EMFILE:
+                    raise
+                print(f"Error reading {path}: {e}", file=sys.stderr)
+                return new_depth
+            files.append(f)
+        # No file has more than limit - current_depth bytes left to compare.
+        block_size = min(EXTEND_CHUNK_SIZE, limit - current_depth)
+        views = [memoryview(bytearray(block_size)) for _ in files]
+
+        # Continue until we reach the limit.
+        while new_depth < limit:
+            # Read the next chunk from each file
+            chunks = [_read_chunk(path, f, view) for path, f, view in zip(paths, files, views)]
+
+            # If any chunk is empty (could be due to reading error), break.
+            if any(len(chunk) == 0 for chunk in chunks):
+                break
+
+            # A single pass over the stacked chunks finds the first differing byte; the chunks are
+            # identical when that is the end of a chunk and all chunks have the same length.
+            chunk_len = len(chunks[0])
+            common = _common_prefix_len(chunks)
+            new_depth += common
+            if common < chunk_len or any(len(chunk) != chunk_len for chunk in chunks):
+                break  # Stop extending as soon as a difference is found.
+            # If the chunk was short (end of file reached), then break out.
+            if chunk_len < block_size:
+                break
+    return min(new_depth, limit)
 
 
 def extend_common_prefix(paths: List[str], current_depth: int, file_size: int) -> int:
@@ -52,7 +232,12 @@ def extend_common_prefix(paths: List[str], current_depth: int, file_size: int) -
     Starting at the given current_depth, this function reads each file in blocks (using
     EXTEND_CHUNK_SIZE) and compares the blocks across all files. If the blocks are identical,
     the function increments the depth by the block length; if differences are found, it
-    determines the exact number of matching bytes in the current block and stops extending.
+    adds the number of matching bytes in the current block and stops extending.
+    The bytes shared by every file are those every file shares with the first one, so a group
+    larger than EXTEND_MAX_OPEN_FILES, or whose read buffers would exceed EXTEND_BATCH_BUFFER_BYTES,
+    is compared in batches that each include the first file, and each batch reads no further than
+    the depth the previous batches agreed on. If the process runs out of file descriptors anyway,
+    the batch is retried at half the size.
 
     Args:
         paths (List[str]): The list of file paths to compare.
@@ -62,138 +247,150 @@ def extend_common_prefix(paths: List[str], current_depth: int, file_size: int) -
     Returns:
         int: The new common prefix length in bytes among all files.
     """
-    new_depth = current_depth
-    # Continue until we reach the file size.
-    while new_depth < file_size:
-        # Read the next chunk from each file
-        chunks = []
-        for path in paths:
-            try:
-                with open(path, "rb") as f:
-                    f.seek(new_depth)
-                    chunk = f.read(EXTEND_CHUNK_SIZE)
-                    chunks.append(chunk)
-            except Exception as e:
-                print(f"Error reading {path}: {e}", file=sys.stderr)
-                chunks.append(b"")
-        
-        # If any chunk is empty (could be due to reading error), break.
-        if any(len(chunk) == 0 for chunk in chunks):
-            break
-
-        # Check if all chunks are identical
-        first_chunk = chunks[0]
-        if all(chunk == first_chunk for chunk in chunks):
-            # All chunks are the same; extend new_depth by the size of this chunk.
-            new_depth += len(first_chunk)
-            # If the chunk was short (end of file reached), then break out.
-            if len(first_chunk) < EXTEND_CHUNK_SIZE:
-                break
-        else:
-            # If chunks differ, compare byte-by-byte to count common matching bytes.
-            match_in_chunk = len(first_chunk)
-            for i in range(len(first_chunk)):
-                # Check the byte in each chunk; if any difference, update match count.
-                current_byte = first_chunk[i]
-                for other_chunk in chunks[1:]:
-                    # If we run out of bytes in any chunk, adjust the match length.
-                    if i >= len(other_chunk) or other_chunk[i] != current_byte:
-                        match_in_chunk = i
-                        break
-                else:
-                    # Continue if inner loop did not break
-                    continue
-                # Break out of the outer loop if a difference was found.
-                break
-
-            new_depth += match_in_chunk
-            break  # Stop extending as soon as a difference is found.
+    first, rest = paths[0], paths[1:]
+    block_size = min(EXTEND_CHUNK_SIZE, file_size - current_depth)
+    batch_size = max(1, min(EXTEND_MAX_OPEN_FILES, EXTEND_BATCH_BUFFER_BYTES // block_size) - 1)
+    new_depth = file_size
+    i = 0
+    while i < len(rest) and new_depth > current_depth:
+        batch = rest[i:i + batch_size]
+        try:
+            new_depth = _extend_batch([first] + batch, current_depth, new_depth)
+        except OSError as e:
+            if batch_size == 1:
+                print(f"Error reading {batch[0]}: {e}", file=sys.stderr)
+                return current_depth
+            batch_size = max(1, batch_size // 2)
+            continue
+        i += len(batch)
     return new_depth
 
 
-def scan_directory(directory: str) -> Dict[Tuple[str, int], Dict]:
+def scan_directory(directory: str) -> Tuple[Dict[Tuple[str, int], int], Dict[Tuple[str, int], List[str]]]:
     """Recursively scan a directory to group files based on an initial checksum and file length.
 
     For every file found under the directory, this function calculates a checksum of the first
     INITIAL_CHUNK_SIZE bytes (or less if the file is smaller) and groups files by the tuple
-    (checksum, file_size). Each group stores the common depth (initially the number of bytes read)
-    and the list of file paths that share that key.
+    (checksum, file_size). Groups are stored as two parallel dictionaries sharing the same keys:
+    one with the common depth (initially the number of bytes read) and one with the file paths.
 
     Args:
         directory (str): The root directory to scan.
 
     Returns:
-        Dict[Tuple[str, int], Dict]: A dictionary where keys are tuples (checksum, file_size) and
-            values are dictionaries with keys:
-                - "depth": int, the number of bytes used in the checksum calculation.
-                - "paths": List[str], a list of file paths that have that checksum and size.
+        Tuple[Dict[Tuple[str, int], int], Dict[Tuple[str, int], List[str]]]: The (depths, paths)
+            dictionaries, both keyed by (checksum, file_size):
+                - depths: the number of bytes used in the checksum calculation.
+                - paths: the list of file paths that have that checksum and size.
     """
-    groups: Dict[Tuple[str, int], Dict] = {}
-    for root, dirs, files in os.walk(directory):
-        print(f"Scanning: {root}")
-        for file in files:
-            file_path = os.path.join(root, file)
-            try:
-                file_size = os.path.getsize(file_path)
-            except Exception as e:
-                print(f"Error getting size of {file_path}: {e}", file=sys.stderr)
-                continue
-
-            # Determine how many bytes to read (if file is smaller than INITIAL_CHUNK_SIZE)
-            depth = min(file_size, INITIAL_CHUNK_SIZE)
-            checksum = compute_checksum(file_path, depth)
-            if checksum == "":
-                continue  # Skip file if checksum could not be computed
-
-            key = (checksum, file_size)
-            if key not in groups:
-                groups[key] = {"depth": depth, "paths": [file_path]}
-            else:
-                print(f"   Possible match: {file_path}")
-                groups[key]["paths"].append(file_path)
-    return groups
-
-
-def update_duplicate_groups(groups: Dict[Tuple[str, int], Dict]) -> List[Dict]:
+    depths: Dict[Tuple[str, int], int] = {}
+    paths: Dict[Tuple[str, int], List[str]] = {}
+    # Directories still to visit. Subdirectories are pushed in reverse so they are popped in
+    # listing order, visiting the tree in the same top-down order as os.walk.
+    stack: List[str] = [directory]
+    while stack:
+        root = stack.pop()
+        logging.info(f"Scanning: {root}")
+        subdirs: List[str] = []
+        try:
+            with os.scandir(root) as it:
+                for entry in it:
+                    # Like os.walk, symlinked directories are listed but not descended into.
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+
+                    file_path = entry.path
+                    try:
+                        # The DirEntry caches its stat result (and gets it for free on Windows).
+                        file_size = entry.stat().st_size
+                    except Exception as e:
+                        print(f"Error getting size of {file_path}: {e}", file=sys.stderr)
+                        continue
+
+                    # Determine how many bytes to read (if file is smaller than INITIAL_CHUNK_SIZE)
+                    depth = min(file_size, INITIAL_CHUNK_SIZE)
+                    checksum = compute_checksum(file_path, depth)
+                    if checksum == "":
+                        continue  # Skip file if checksum could not be computed
+
+                    key = (checksum, file_size)
+                    group_paths = paths.get(key)
+                    if group_paths is None:
+                        depths[key] = depth
+                        paths[key] = [file_path]
+                    else:
+                        logging.debug(f"   Possible match: {file_path}")
+                        group_paths.append(file_path)
+        except OSError as e:
+            print(f"Error scanning {root}: {e}", file=sys.stderr)
+        stack.extend(reversed(subdirs))
+    return depths, paths
+
+
+def update_duplicate_groups(depths: Dict[Tuple[str, int], int],
+                            paths: Dict[Tuple[str, int], List[str]]) -> List[Dict]:
     """Extend the comparison for groups with potential duplicates and filter out unique entries.
 
     For groups with more than one file, this function extends the comparison (the depth) by
     reading further parts of the file until the end of file is reached or a difference is found.
-    After extension, any group containing only one file is discarded.
+    Groups containing only one file are discarded.
 
     Args:
-        groups (Dict[Tuple[str, int], Dict]): The initial grouping of files from scan_directory.
+        depths (Dict[Tuple[str, int], int]): The initial common depth of each group from scan_directory.
+            Updated in place with the extended depths.
+        paths (Dict[Tuple[str, int], List[str]]): The file paths of each group from scan_directory.
 
     Returns:
         List[Dict]: A list of dictionaries. Each dictionary represents a group with duplicate files,
             including the initial checksum, file size, common prefix (depth), and list of paths.
     """
     duplicates = []
-    for key, group in groups.items():
-        paths = group["paths"]
-        file_size = key[1]
+    for key, group_paths in paths.items():
         # Only process groups with more than one file.
-        if len(paths) < 2:
+        if len(group_paths) < 2:
             continue
 
-        current_depth = group["depth"]
+        checksum, file_size = key
+        depth = depths[key]
         # If the current compared depth does not cover the full file, extend the comparison.
-        if current_depth < file_size:
-            new_depth = extend_common_prefix(paths, current_depth, file_size)
-            group["depth"] = new_depth
-
-        # Only keep groups with more than one file.
-        if len(group["paths"]) > 1:
-            duplicate_group = {
-                "initial_checksum": key[0],
-                "file_size": file_size,
-                "common_prefix": group["depth"],
-                "files": paths,
-            }
-            duplicates.append(duplicate_group)
+        if depth < file_size:
+            depth = extend_common_prefix(group_paths, depth, file_size)
+            depths[key] = depth
+
+        duplicates.append({
+            "initial_checksum": checksum,
+            "file_size": file_size,
+            "common_prefix": depth,
+            "files": group_paths,
+        })
     return duplicates
 
 
+def write_json(path: str, data: Any) -> None:
+    """Write data to a file as indented JSON.
+
+    The report is dumped with orjson when it is installed. orjson rejects paths whose names are not
+    valid UTF-8 (os.scandir keeps those bytes as lone surrogates); such a report is written by the
+    standard library json module instead, which escapes them as \\udcXX.
+
+    Args:
+        path (str): The output file path.
+        data (Any): The JSON-serializable data to write.
+    """
+    encoded = None
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            pass
+    if encoded is None:
+        encoded = (json.dumps(data, indent=2) + "\n").encode("utf-8")
+    with open(path, "wb") as outfile:
+        outfile.write(encoded)
+
+
 def parse_arguments() -> argparse.Namespace:
     """Parse command line arguments.
 
@@ -213,6 +410,9 @@ def parse_arguments() -> argparse.Namespace:
         type=str,
         help="JSON file where deduplication analysis results will be stored.",
     )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Report scan progress and possible matches."
+    )
     return parser.parse_args()
 
 
@@ -220,18 +420,21 @@ def main() -> None:
     """The main function that orchestrates the deduplication analysis and writes the output JSON."""
     args = parse_arguments()
 
+    # Progress messages are only shown when asked for; printing one per directory slows large scans.
+    logging_level = logging.DEBUG if args.verbose else logging.WARNING
+    logging.basicConfig(level=logging_level, format="%(levelname)s: %(message)s")
+
     if not os.path.isdir(args.dir):
         print(f"Error: Directory '{args.dir}' does not exist or is not a directory.", file=sys.stderr)
         sys.exit(1)
 
     # Scan directory and group files by initial checksum and file size.
-    groups = scan_directory(args.dir)
+    depths, paths = scan_directory(args.dir)
     # Process groups to extend checksum comparison and remove groups with only one file.
-    duplicates = update_duplicate_groups(groups)
+    duplicates = update_duplicate_groups(depths, paths)
 
     try:
-        with open(args.output, "w") as outfile:
-            json.dump({"duplicates": duplicates}, outfile, indent=4)
+        write_json(args.output, {"duplicates": duplicates})
         print(f"Deduplication analysis complete. Results written to {args.output}")
     except Exception as e:
         print(f"Error writing to output file {args.output}: {e}", file=sys.stderr)
@@ -2,86 +2,210 @@
 primality_checker.py
 
 A command-line tool for analyzing whether a given number is prime.
-Applies simple mental math tests, trial division, and advanced probabilistic tests.
+Applies simple mental math tests, deterministic Miller-Rabin, and advanced probabilistic tests.
 Provides clear walkthroughs and explanations at each step.
 
 Usage:
-    python primality_checker.py <number>
+    python primality_checker.py <number> [--verbose [--decimal-trace]]
+    python primality_checker.py --range <start> <end>
 
 Example:
-    python primality_checker.py 2025
+    python primality_checker.py 2025 --verbose
+    python primality_checker.py --range 1000000 1001000
+
+The --range mode lists every prime in [start, end] without explanations. It uses a
+segmented sieve up to SIEVE_RANGE_LIMIT (vectorized with NumPy when it is installed)
+and parallel probable-prime tests beyond that.
 """
 
 import sys
 import math
+import argparse
 import random
-from typing import Tuple
+import bisect
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the range sieve falls back to bytearrays
+    np = None
+
+def primes_below(limit: int) -> List[int]:
+    """Return all primes below limit using the sieve of Eratosthenes.
+
+    Args:
+        limit (int): Exclusive upper bound.
+
+    Returns:
+        List[int]: The primes in increasing order.
+    """
+    sieve = bytearray([1]) * max(limit, 2)
+    sieve[0] = sieve[1] = 0
+    for i in range(2, math.isqrt(max(limit - 1, 0)) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if sieve[i]]
+
+# The first 300 primes (up to 1987) and their product, so one gcd finds any of them in n.
+# Trial division sweeps the same table before moving on to the wheel.
+SMALL_PRIMES: Tuple[int, ...] = tuple(primes_below(2000)[:300])
+PRIMORIAL_SMALL = math.prod(SMALL_PRIMES)
+
+# Wheel modulus 2*3*5*7*11: only residues coprime to it can be prime.
+WHEEL_MODULUS = 2 * 3 * 5 * 7 * 11
+WHEEL_RESIDUES: Tuple[int, ...] = tuple(r for r in range(1, WHEEL_MODULUS + 1) if math.gcd(r, WHEEL_MODULUS) == 1)
+# Gaps between successive residues, wrapping around to the first residue of the next turn.
+WHEEL_INCREMENTS: Tuple[int, ...] = tuple(
+    b - a for a, b in zip(WHEEL_RESIDUES, WHEEL_RESIDUES[1:] + (WHEEL_MODULUS + WHEEL_RESIDUES[0],))
+)
+
+# Deterministic Miller-Rabin: (bound, witnesses) such that testing every witness proves
+# primality for all n < bound. Ordered by bound so the smallest sufficient set is used.
+MR_WITNESS_TABLE: Tuple[Tuple[int, Tuple[int, ...]], ...] = (
+    (2_047, (2,)),
+    (1_373_653, (2, 3)),
+    (25_326_001, (2, 3, 5)),
+    (3_215_031_751, (2, 3, 5, 7)),
+    (2_152_302_898_747, (2, 3, 5, 7, 11)),
+    (3_474_749_660_383, (2, 3, 5, 7, 11, 13)),
+    (341_550_071_728_321, (2, 3, 5, 7, 11, 13, 17)),
+    (3_825_123_056_546_413_051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318_665_857_834_031_151_167_461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3_317_044_064_679_887_385_961_981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+)
+DETERMINISTIC_MR_LIMIT = MR_WITNESS_TABLE[-1][0]
+
+# Below this, the explicit perfect-square check is cheaper than the tests that would also reject
+# a square; above it, isqrt costs about as much as a Miller-Rabin round and is left to them.
+SMALL_SQ_THRESHOLD = 10**12
+
+# In verbose traces, residues of larger moduli are shown in hex with their bit length, because
+# converting a big int to decimal takes quadratic time while hex is linear.
+DECIMAL_TRACE_MAX_BITS = 64
+
+# --range sieves numbers up to this bound (base primes up to 10**6) in segments of this many
+# numbers; larger numbers are tested individually across worker processes.
+SIEVE_RANGE_LIMIT = 10**12
+SIEVE_SEGMENT_SIZE = 1 << 20
 
 def is_divisible_by_small_primes(n: int) -> bool:
     """Check divisibility by small primes with explanations.
 
+    A single gcd with PRIMORIAL_SMALL tells whether any of the first 300 primes divides n;
+    the primes are only scanned to name the factor once one is known to exist.
+
     Args:
         n (int): Number to check.
 
     Returns:
         bool: True if divisible by any small prime, else False.
     """
-    small_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
     print("\n[Stage 1] Easy divisibility tests:")
     if n == 2 or n == 3:
         print(f"{n} is 2 or 3, both primes.")
         return False
 
-    if n % 2 == 0:
-        print(f"{n} is even (divisible by 2). Not prime.")
-        return True
-
-    for p in small_primes[1:]:
-        if n % p == 0:
-            print(f"{n} is divisible by {p}. {n} / {p} = {n//p}")
-            return True
+    g = math.gcd(n, PRIMORIAL_SMALL)
+    if g != 1:
+        # g == n when n is itself one of the small primes (or a product of them).
+        for p in SMALL_PRIMES:
+            if g % p == 0 and p != n:
+                if p == 2:
+                    print(f"{n} is even (divisible by 2). Not prime.")
+                else:
+                    print(f"{n} is divisible by {p}. {n} / {p} = {n//p}")
+                return True
     print(f"{n} passed simple divisibility tests.")
     return False
 
-def is_perfect_square(n: int) -> bool:
+def is_perfect_square(n: int, root: Optional[int] = None) -> bool:
     """Check if n is a perfect square.
 
     Args:
         n (int): Number to check.
+        root (Optional[int]): math.isqrt(n), if the caller already has it.
 
     Returns:
         bool: True if n is a perfect square.
     """
-    root = math.isqrt(n)
+    if root is None:
+        root = math.isqrt(n)
     if root * root == n:
         print(f"{n} is a perfect square ({root} * {root}). Not prime.")
         return True
     return False
 
-def trial_division(n: int) -> bool:
+def trial_division(n: int, verbose: bool = False, root: Optional[int] = None,
+                   small_primes_checked: bool = False) -> bool:
     """Perform trial division up to sqrt(n).
 
+    The primes in SMALL_PRIMES are tried first; beyond them only candidates coprime to
+    2*3*5*7*11 are tried, stepping through WHEEL_INCREMENTS.
+
     Args:
         n (int): Number to check.
+        verbose (bool): Also report how many candidate divisors were tried.
+        root (Optional[int]): math.isqrt(n), if the caller already has it.
+        small_primes_checked (bool): n is already known to have no factor in SMALL_PRIMES
+            (is_divisible_by_small_primes returned False), so go straight to the wheel.
 
     Returns:
         bool: True if prime, else False.
     """
     print("\n[Stage 2] Trial Division up to sqrt(n):")
-    limit = math.isqrt(n) + 1
-    for i in range(2, limit):
-        if n % i == 0:
-            print(f"{n} is divisible by {i}. {n} / {i} = {n//i}")
-            return False
+    if root is None:
+        root = math.isqrt(n)
+    limit = root + 1
+    divisor = None
+    tried = 0
+    for p in (() if small_primes_checked else SMALL_PRIMES):
+        if p >= limit:
+            break
+        tried += 1
+        if n % p == 0:
+            divisor = p
+            break
+    else:
+        # Start the wheel at the first residue past the small-prime table.
+        start = bisect.bisect_right(WHEEL_RESIDUES, SMALL_PRIMES[-1])
+        i = WHEEL_RESIDUES[start]
+        increments = itertools.cycle(WHEEL_INCREMENTS[start:] + WHEEL_INCREMENTS[:start])
+        while i < limit:
+            tried += 1
+            if n % i == 0:
+                divisor = i
+                break
+            i += next(increments)
+
+    if verbose:
+        print(f"Tried {tried} candidate divisors.")
+    if divisor is not None:
+        print(f"{n} is divisible by {divisor}. {n} / {divisor} = {n//divisor}")
+        return False
     print(f"No divisors found up to sqrt({n}) = {limit-1}.")
     return True
 
-def miller_rabin(n: int, k: int = 5) -> bool:
+def format_residue(x: int) -> str:
+    """Describe a big residue cheaply: its hex digits and bit length."""
+    return f"{x:#x} ({x.bit_length()} bits)"
+
+def miller_rabin(n: int, k: int = 5, witnesses: Optional[Sequence[int]] = None,
+                 verbose: bool = False, decimal_trace: bool = False) -> bool:
     """Apply Miller-Rabin primality test with detailed explanation.
 
+    The per-round walkthrough is only produced when verbose is set. It is collected while the
+    rounds run and printed once afterwards, since formatting large residues in decimal can cost
+    more than the modular arithmetic itself. For n above DECIMAL_TRACE_MAX_BITS bits, values are
+    shown with format_residue unless decimal_trace is set.
+
     Args:
         n (int): Number to check.
-        k (int): Number of iterations (default 5).
+        k (int): Number of iterations with random bases (default 5).
+        witnesses (Optional[Sequence[int]]): Fixed bases to test instead of k random ones.
+        verbose (bool): Show every round and squaring step.
+        decimal_trace (bool): Show values in decimal in the verbose trace regardless of size.
 
     Returns:
         bool: True if probably prime, else False.
@@ -92,67 +216,338 @@ def miller_rabin(n: int, k: int = 5) -> bool:
     if n <= 1 or n % 2 == 0:
         return False
 
-    # Write n-1 as d*2^r
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
+    # Write n-1 as d*2^r: the lowest set bit of n-1 gives r directly
+    m = n - 1
+    r = (m & -m).bit_length() - 1
+    d = m >> r
 
     print(f"We write {n}-1 = {d} * 2^{r}")
 
-    for i in range(k):
-        a = random.randrange(2, n - 1)
+    if witnesses is None:
+        # Reduce a few extra random bits mod n-3 rather than using randrange's rejection loop;
+        # the bias of at most 2^-16 does not matter for choosing bases in [2, n-2].
+        bits = n.bit_length() + 16
+        bases = [2 + random.getrandbits(bits) % (n - 3) for _ in range(k)]
+    else:
+        # A base that is a multiple of n says nothing about n.
+        bases = [a for a in witnesses if a % n != 0]
+
+    fmt = str if decimal_trace or n.bit_length() <= DECIMAL_TRACE_MAX_BITS else format_residue
+    log: List[str] = []
+    witness = None
+    for i, a in enumerate(bases):
         x = pow(a, d, n)
-        print(f"Round {i+1}: base a = {a}, compute a^d % n = {x}")
+        if verbose:
+            log.append(f"Round {i+1}: base a = {fmt(a)}, compute a^d % n = {fmt(x)}")
         if x == 1 or x == n - 1:
-            print(f"Base {a} passes initial test (x = {x}).")
+            if verbose:
+                log.append(f"Base {fmt(a)} passes initial test (x = {fmt(x)}).")
             continue
         for j in range(r - 1):
             x = pow(x, 2, n)
-            print(f"  Square x -> x = {x}")
+            if verbose:
+                log.append(f"  Square x -> x = {fmt(x)}")
             if x == n - 1:
-                print(f"  Base {a} passes inner loop (x became n-1).")
+                if verbose:
+                    log.append(f"  Base {fmt(a)} passes inner loop (x became n-1).")
                 break
         else:
-            print(f"  ❌ Base {a} reveals {n} is composite.")
-            return False
-    print(f"✅ Passed {k} rounds of Miller-Rabin. {n} is probably prime.")
+            witness = a
+            break
+
+    if log:
+        print("\n".join(log))
+    if witness is not None:
+        print(f"  ❌ Base {witness} reveals {n} is composite.")
+        return False
+    print(f"✅ Passed {len(bases)} rounds of Miller-Rabin. {n} is probably prime.")
     return True
 
-def baillie_psw(n: int) -> bool:
+def deterministic_mr(n: int, verbose: bool = False, decimal_trace: bool = False) -> bool:
+    """Miller-Rabin with a fixed witness set that is proven sufficient for n.
+
+    Args:
+        n (int): Number to check; must be below DETERMINISTIC_MR_LIMIT.
+        verbose (bool): Show every Miller-Rabin round.
+        decimal_trace (bool): Show values in decimal in the verbose trace regardless of size.
+
+    Returns:
+        bool: True if prime, else False.
+    """
+    for bound, witnesses in MR_WITNESS_TABLE:
+        if n < bound:
+            print(f"\nFor n < {bound}, the bases {list(witnesses)} decide primality exactly.")
+            return miller_rabin(n, witnesses=witnesses, verbose=verbose, decimal_trace=decimal_trace)
+    raise ValueError(f"{n} is too large for deterministic Miller-Rabin")
+
+def baillie_psw(n: int, verbose: bool = False, decimal_trace: bool = False) -> bool:
     """Baillie-PSW primality test: combination of Miller-Rabin and Lucas.
 
     Args:
         n (int): Number to check.
+        verbose (bool): Show every Miller-Rabin round.
+        decimal_trace (bool): Show values in decimal in the verbose trace regardless of size.
 
     Returns:
         bool: True if probably prime, else False.
     """
     print("\n[Stage 4] Baillie-PSW test (Miller-Rabin base 2 + Lucas test):")
-    if not miller_rabin(n, 1):
+    if not miller_rabin(n, witnesses=(2,), verbose=verbose, decimal_trace=decimal_trace):
         return False
     return lucas_primality(n)
 
+def jacobi(a: int, n: int) -> int:
+    """Compute the Jacobi symbol (a/n).
+
+    Args:
+        a (int): Any integer.
+        n (int): Odd positive integer.
+
+    Returns:
+        int: -1, 0 or 1.
+    """
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def selfridge_parameters(n: int) -> Optional[Tuple[int, int, int]]:
+    """Choose Lucas parameters by Selfridge's Method A.
+
+    D is the first of 5, -7, 9, -11, ... with Jacobi symbol (D/n) = -1; then P = 1 and Q = (1 - D) / 4.
+    n must be odd and not a perfect square, or no such D exists.
+
+    Args:
+        n (int): Odd number greater than 2 to check.
+
+    Returns:
+        Optional[Tuple[int, int, int]]: (D, P, Q), or None if the search found a factor of n.
+    """
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            return D, 1, (1 - D) // 4
+        if j == 0 and abs(D) != n:
+            return None
+        D = -D - 2 if D > 0 else -D + 2
+
+def strong_lucas_prp(n: int, D: int, P: int, Q: int) -> bool:
+    """Strong Lucas probable prime test with the given parameters.
+
+    Writes n+1 = d*2^s and computes U_d, V_d and Q^d with a binary ladder, then checks whether
+    U_d = 0 or V_(d*2^r) = 0 (mod n) for some 0 <= r < s.
+
+    Args:
+        n (int): Odd number to check.
+        D (int): Discriminant P^2 - 4Q, with Jacobi symbol (D/n) = -1.
+        P (int): Lucas parameter P.
+        Q (int): Lucas parameter Q.
+
+    Returns:
+        bool: True if n is a strong Lucas probable prime, else False.
+    """
+    m = n + 1
+    s = (m & -m).bit_length() - 1
+    d = m >> s
+
+    def half(x: int) -> int:
+        # Division by 2 modulo odd n
+        x %= n
+        return (x + n) // 2 if x % 2 else x // 2
+
+    U, V, Qk = 1, P % n, Q % n
+    for bit in bin(d)[3:]:
+        U, V, Qk = U * V % n, (V * V - 2 * Qk) % n, Qk * Qk % n
+        if bit == "1":
+            U, V, Qk = half(P * U + V), half(D * U + P * V), Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V, Qk = (V * V - 2 * Qk) % n, Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
 def lucas_primality(n: int) -> bool:
-    """Lucas probable prime test (simplified form).
+    """Strong Lucas probable prime test with Selfridge's parameters, the second half of Baillie-PSW.
 
     Args:
-        n (int): Number to check.
+        n (int): Odd number greater than 2 to check.
 
     Returns:
         bool: True if passes Lucas conditions.
     """
-    print("Lucas test is not fully implemented — assuming True for demonstration.")
-    # Full Lucas test is very complex and would go here.
-    return True
+    root = math.isqrt(n)
+    if root * root == n:
+        # No suitable D exists for a square, and a square is never prime.
+        print(f"{n} is a perfect square ({root} * {root}). Not prime.")
+        return False
+    params = selfridge_parameters(n)
+    if params is None:
+        print(f"The search for D found a common factor with {n}. Not prime.")
+        return False
+    D, P, Q = params
+    print(f"Lucas parameters (Selfridge): D = {D}, P = {P}, Q = {Q}")
+    if strong_lucas_prp(n, D, P, Q):
+        print(f"✅ {n} is a strong Lucas probable prime.")
+        return True
+    print(f"  ❌ {n} fails the strong Lucas test and is composite.")
+    return False
+
+def sieve_segment(lo: int, hi: int, base_primes: Sequence[int]) -> List[int]:
+    """Return the primes in [lo, hi), crossing off multiples of base_primes.
+
+    Args:
+        lo (int): Inclusive lower bound, at least 2.
+        hi (int): Exclusive upper bound.
+        base_primes (Sequence[int]): All primes up to sqrt(hi - 1), in increasing order.
+
+    Returns:
+        List[int]: The primes in the segment.
+    """
+    size = hi - lo
+    is_prime = np.ones(size, dtype=bool) if np is not None else bytearray([1]) * size
+    for p in base_primes:
+        if p * p >= hi:
+            break
+        start = max(p * p, (lo + p - 1) // p * p) - lo
+        if np is not None:
+            is_prime[start::p] = False
+        else:
+            is_prime[start::p] = bytes(len(range(start, size, p)))
+    if np is not None:
+        return (np.flatnonzero(is_prime) + lo).tolist()
+    return [lo + i for i, flag in enumerate(is_prime) if flag]
+
+def sieve_range(lo: int, hi: int) -> Iterator[List[int]]:
+    """Segmented sieve of Eratosthenes over [lo, hi), yielding the primes of each segment.
+
+    Args:
+        lo (int): Inclusive lower bound.
+        hi (int): Exclusive upper bound.
+
+    Yields:
+        List[int]: The primes of the next segment of at most SIEVE_SEGMENT_SIZE numbers.
+    """
+    lo = max(lo, 2)
+    base_primes = primes_below(math.isqrt(max(hi - 1, 0)) + 1)
+    for seg_lo in range(lo, hi, SIEVE_SEGMENT_SIZE):
+        yield sieve_segment(seg_lo, min(seg_lo + SIEVE_SEGMENT_SIZE, hi), base_primes)
+
+def is_probable_prime(n: int) -> bool:
+    """Quiet primality test for batch use: small primes, then Miller-Rabin.
+
+    The answer is exact below DETERMINISTIC_MR_LIMIT; above it, the Baillie-PSW test
+    (Miller-Rabin base 2 plus a strong Lucas test) is used.
+
+    Args:
+        n (int): Number to check.
+
+    Returns:
+        bool: True if n is (probably) prime, else False.
+    """
+    if n < 2:
+        return False
+    if math.gcd(n, PRIMORIAL_SMALL) != 1:
+        # n has a factor in SMALL_PRIMES, so it is prime only if it is one of them.
+        return n <= SMALL_PRIMES[-1] and SMALL_PRIMES[bisect.bisect_left(SMALL_PRIMES, n)] == n
+    m = n - 1
+    r = (m & -m).bit_length() - 1
+    d = m >> r
+    deterministic = n < DETERMINISTIC_MR_LIMIT
+    witnesses = next(w for bound, w in MR_WITNESS_TABLE if n < bound) if deterministic else (2,)
+    for a in witnesses:
+        x = pow(a, d, n)
+        if x == 1 or x == m:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == m:
+                break
+        else:
+            return False
+    if deterministic:
+        return True
+    if math.isqrt(n) ** 2 == n:
+        return False
+    params = selfridge_parameters(n)
+    return params is not None and strong_lucas_prp(n, *params)
+
+def parallel_range(lo: int, hi: int) -> Iterator[List[int]]:
+    """Test the odd numbers in [lo, hi) with is_probable_prime across worker processes.
+
+    Args:
+        lo (int): Inclusive lower bound.
+        hi (int): Exclusive upper bound.
+
+    Yields:
+        List[int]: The primes found in each block of SIEVE_SEGMENT_SIZE numbers, in order.
+    """
+    with ProcessPoolExecutor() as executor:
+        for block_lo in range(lo, hi, SIEVE_SEGMENT_SIZE):
+            block_hi = min(block_lo + SIEVE_SEGMENT_SIZE, hi)
+            candidates = range(block_lo | 1, block_hi, 2)
+            flags = executor.map(is_probable_prime, candidates, chunksize=256)
+            primes = [n for n, flag in zip(candidates, flags) if flag]
+            if block_lo <= 2 < block_hi:
+                primes.insert(0, 2)
+            yield primes
+
+def list_primes_in_range(start: int, end: int) -> int:
+    """Print every prime in [start, end], one per line.
+
+    Args:
+        start (int): Inclusive lower bound.
+        end (int): Inclusive upper bound.
+
+    Returns:
+        int: How many primes were found.
+    """
+    hi = end + 1
+    # Sieve the part of the range up to SIEVE_RANGE_LIMIT and test only what lies beyond it.
+    split = SIEVE_RANGE_LIMIT + 1
+    segments = itertools.chain(
+        sieve_range(start, min(hi, split)) if start < split else (),
+        parallel_range(max(start, split), hi) if hi > split else (),
+    )
+    count = 0
+    for primes in segments:
+        if primes:
+            sys.stdout.write("\n".join(map(str, primes)) + "\n")
+            count += len(primes)
+    return count
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python primality_checker.py <number>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Analyze whether a number is prime, explaining each step.")
+    parser.add_argument("number", nargs="?", help="The integer to check.")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Show every round of the probabilistic tests.")
+    parser.add_argument("--decimal-trace", action="store_true",
+                        help="With --verbose, show large values in decimal instead of hex and bit length.")
+    parser.add_argument("--range", nargs=2, type=int, metavar=("START", "END"),
+                        help="List all primes in [START, END] instead of analyzing one number.")
+    args = parser.parse_args()
+
+    if args.range:
+        start, end = args.range
+        count = list_primes_in_range(start, end)
+        print(f"\n{count} primes in [{start}, {end}].")
+        sys.exit(0)
+    if args.number is None:
+        parser.error("a number or --range is required")
 
     try:
-        n = int(sys.argv[1])
+        n = int(args.number)
     except ValueError:
         print("Please provide a valid integer.")
         sys.exit(1)
@@ -167,18 +562,21 @@ def main():
         print(f"\n✅ {n} is composite (small divisibility found).")
         sys.exit(0)
 
-    if is_perfect_square(n):
-        print(f"\n✅ {n} is composite (perfect square).")
-        sys.exit(0)
+    if n < SMALL_SQ_THRESHOLD:
+        # Compute isqrt once for every stage that needs it.
+        root = math.isqrt(n)
+        if is_perfect_square(n, root):
+            print(f"\n✅ {n} is composite (perfect square).")
+            sys.exit(0)
 
     # Continue with deeper methods
-    if n < 10**6:
-        if trial_division(n):
-            print(f"\n✅ {n} is prime (trial division).")
+    if n < DETERMINISTIC_MR_LIMIT:
+        if deterministic_mr(n, verbose=args.verbose, decimal_trace=args.decimal_trace):
+            print(f"\n✅ {n} is prime (deterministic Miller-Rabin).")
         else:
-            print(f"\n✅ {n} is composite (trial division).")
+            print(f"\n✅ {n} is composite (deterministic Miller-Rabin).")
     else:
-        if baillie_psw(n):
+        if baillie_psw(n, verbose=args.verbose, decimal_trace=args.decimal_trace):
             print(f"\n✅ {n} is probably prime (Baillie-PSW test).")
         else:
             print(f"\n✅ {n} is composite (Baillie-PSW test).")
@@ -12,19 +12,25 @@ Options:
 
 Dependencies:
     - Python 3.x
-    - Internet connection (if using word-based renaming, as it downloads a word list)
+    - Internet connection (if using word-based renaming, the first time, as it downloads a word list
+      and caches it in ~/.cache/rename_uuid)
 """
 
 import argparse
 import os
+import sys
 import uuid
 import random
+import tempfile
 import urllib.request
-from typing import List, Callable, NoReturn
+from typing import Callable, List, NoReturn, Optional, Sequence, Tuple
 
 # URL to download a word list from.
 WORD_LIST_URL = "https://raw.githubusercontent.com/dwyl/english-words/master/words_alpha.txt"
 
+# Local copy of the word list, so it is only downloaded once.
+WORD_LIST_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "rename_uuid", "words_alpha.txt")
+
 def generate_uuid_name(ext: str = "") -> str:
     """Generate a new UUID4-based name with an optional file extension.
 
@@ -37,12 +43,12 @@ def generate_uuid_name(ext: str = "") -> str:
     new_uuid = str(uuid.uuid4())
     return f"{new_uuid}{ext}" if ext else new_uuid
 
-def generate_words_name(word_list: List[str], ext: str = "") -> str:
+def generate_words_name(word_list: Sequence[str], ext: str = "") -> str:
     """Generate a new name composed of a random sequence of 4 English words, joined by dashes.
     The file extension is preserved if provided.
 
     Args:
-        word_list (List[str]): List of English words to sample from.
+        word_list (Sequence[str]): English words to sample from.
         ext (str, optional): The file extension (including the dot) to append. Defaults to "".
 
     Returns:
@@ -52,32 +58,124 @@ def generate_words_name(word_list: List[str], ext: str = "") -> str:
     name = "-".join(words)
     return f"{name}{ext}" if ext else name
 
-def get_word_list(url: str) -> List[str]:
-    """Download a list of English words from the given URL and return it as a list.
+def read_cached_word_list(cache_path: str) -> Optional[str]:
+    """Read the cached word list, if there is one.
+
+    Args:
+        cache_path (str): Path of the cached word list.
+
+    Returns:
+        Optional[str]: The contents of the cache, or None if it is missing or unreadable.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def write_cached_word_list(cache_path: str, data: str) -> None:
+    """Write the word list to the cache atomically, so an interrupted write never leaves a partial cache.
+
+    Failing to write the cache is not fatal; the list is simply downloaded again next time.
+
+    Args:
+        cache_path (str): Path of the cached word list.
+        data (str): The word list contents.
+    """
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".words-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"Warning: could not cache word list at {cache_path}: {e}")
+
+def get_word_list(url: str, cache_path: str = WORD_LIST_CACHE) -> Tuple[str, ...]:
+    """Return a list of English words, downloading it from the given URL only if it is not cached yet.
 
     Args:
         url (str): The URL to download the word list from.
+        cache_path (str, optional): Where the downloaded list is cached. Defaults to WORD_LIST_CACHE.
 
     Returns:
-        List[str]: A list of English words.
+        Tuple[str, ...]: The English words.
 
     Raises:
         SystemExit: If an error occurs during the download.
     """
+    data = read_cached_word_list(cache_path)
+    if data is None:
+        print("Downloading word list...")
+        try:
+            with urllib.request.urlopen(url) as response:
+                data = response.read().decode('utf-8')
+        except Exception as e:
+            print(f"Error downloading word list: {e}")
+            exit(1)  # Exit with an error code
+        write_cached_word_list(cache_path, data)
+    words = tuple(line.strip() for line in data.splitlines() if line.strip())
+    return words
+
+def rename_directory_contents(current_dir: str, name_generator: Callable[[str], str], log: List[str]) -> None:
+    """Rename everything below current_dir, deepest entries first.
+
+    Subdirectories are processed before the directory itself is renamed, so no path is renamed
+    while entries below it still need it. Symbolic links to directories are renamed but not followed.
+
+    Args:
+        current_dir (str): The directory whose contents are renamed.
+        name_generator (Callable[[str], str]): A function that generates a new name given an optional extension.
+        log (List[str]): Buffer for the progress messages; flushed to stdout once per directory.
+
+    Returns:
+        None
+    """
+    files = []
+    dirs = []
+    try:
+        with os.scandir(current_dir) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry)
+    except OSError:
+        return  # Unreadable directories are skipped, as os.walk does.
+
+    for entry in dirs:
+        if not entry.is_symlink():
+            rename_directory_contents(entry.path, name_generator, log)
+
     try:
-        with urllib.request.urlopen(url) as response:
-            data = response.read().decode('utf-8')
-        words = [line.strip() for line in data.splitlines() if line.strip()]
-        return words
-    except Exception as e:
-        print(f"Error downloading word list: {e}")
-        exit(1)  # Exit with an error code
+        # Rename files first, preserving extensions.
+        for entry in files:
+            _, ext = os.path.splitext(entry.name)
+            new_path = os.path.join(current_dir, name_generator(ext))
+            log.append(f"Renaming file: {entry.path} -> {new_path}\n")
+            os.rename(entry.path, new_path)
+
+        # Rename directories (directories do not have extensions).
+        for entry in dirs:
+            new_path = os.path.join(current_dir, name_generator(""))
+            log.append(f"Renaming directory: {entry.path} -> {new_path}\n")
+            os.rename(entry.path, new_path)
+    finally:
+        sys.stdout.writelines(log)
+        sys.stdout.flush()
+        log.clear()
 
 def rename_files_and_directories(root_path: str, name_generator: Callable[[str], str]) -> None:
     """Recursively rename all files and directories in the given root path using the provided naming function.
 
-    The renaming is performed in a bottom-up manner (via os.walk with topdown=False)
-    to avoid issues with renaming directories before their contents.
+    The renaming is performed in a bottom-up manner (via rename_directory_contents, which walks
+    the tree with os.scandir) to avoid issues with renaming directories before their contents.
 
     Args:
         root_path (str): The root directory where renaming begins.
@@ -86,23 +184,7 @@ def rename_files_and_directories(root_path: str, name_generator: Callable[[str],
     Returns:
         None
     """
-    for current_dir, dirs, files in os.walk(root_path, topdown=False):
-        # Rename files first, preserving extensions.
-        for filename in files:
-            old_path = os.path.join(current_dir, filename)
-            _, ext = os.path.splitext(filename)
-            new_name = name_generator(ext)
-            new_path = os.path.join(current_dir, new_name)
-            print(f"Renaming file: {old_path} -> {new_path}")
-            os.rename(old_path, new_path)
-        
-        # Rename directories (directories do not have extensions).
-        for directory in dirs:
-            old_path = os.path.join(current_dir, directory)
-            new_name = name_generator("")
-            new_path = os.path.join(current_dir, new_name)
-            print(f"Renaming directory: {old_path} -> {new_path}")
-            os.rename(old_path, new_path)
+    rename_directory_contents(root_path, name_generator, [])
 
 def parse_arguments() -> argparse.Namespace:
     """Parse command-line arguments.
@@ -129,7 +211,7 @@ def parse_arguments() -> argparse.Namespace:
 def main() -> NoReturn:
     """Main function to execute the renaming process.
 
-    Validates the input path, optionally downloads a word list if words mode is enabled,
+    Validates the input path, optionally loads the word list if words mode is enabled,
     and calls the renaming function.
     """
     args = parse_arguments()
@@ -144,7 +226,6 @@ def main() -> NoReturn:
 
     # Determine which naming function to use.
     if args.words:
-        print("Downloading word list...")
         word_list = get_word_list(WORD_LIST_URL)
         name_generator = lambda ext: generate_words_name(word_list, ext)  # Use word-based naming
     else:
@@ -6,16 +6,22 @@ server_totp.py
 A simple TOTP "server" emulator that generates a shared secret key, displays
 a QR code for provisioning an authenticator app, and prints the current
 6-digit one‑time passcode to the console each time it changes.
+
+The QR code is printed to the terminal as text; pass --image to open it in an
+image viewer instead.
 """
 
 import argparse
+import functools
 import sys
 import time
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import pyotp
 import qrcode
-from PIL.Image import Image  # type: ignore
+
+if TYPE_CHECKING:
+    from PIL.Image import Image  # type: ignore
 
 
 def generate_shared_secret() -> str:
@@ -28,6 +34,35 @@ def generate_shared_secret() -> str:
     return pyotp.random_base32()
 
 
+@functools.lru_cache(maxsize=8)
+def get_totp(secret: str) -> pyotp.TOTP:
+    """
+    Return the TOTP generator for a secret, creating it only once per secret.
+
+    Args:
+        secret (str): The shared secret key.
+
+    Returns:
+        pyotp.TOTP: The TOTP generator.
+    """
+    return pyotp.TOTP(secret)
+
+
+@functools.lru_cache(maxsize=256)
+def code_for(secret: str, counter: int) -> str:
+    """
+    Return the TOTP code for a time step, computing each step's HMAC only once.
+
+    Args:
+        secret (str): The shared secret key.
+        counter (int): The time step, i.e. the Unix time divided by the TOTP interval.
+
+    Returns:
+        str: The one-time passcode for that step.
+    """
+    return get_totp(secret).generate_otp(counter)
+
+
 def create_provisioning_uri(secret: str, account_name: str, issuer_name: str) -> str:
     """
     Create a provisioning URI for TOTP setup in authenticator apps.
@@ -40,11 +75,24 @@ def create_provisioning_uri(secret: str, account_name: str, issuer_name: str) ->
     Returns:
         str: A URI containing the TOTP parameters for QR code generation.
     """
-    totp = pyotp.TOTP(secret)
+    totp = get_totp(secret)
     return totp.provisioning_uri(name=account_name, issuer_name=issuer_name)
 
 
-def display_qr_code(data: str) -> Optional[Image]:
+def print_qr_code(data: str) -> None:
+    """
+    Print a QR code for the given data to the terminal as text.
+
+    Args:
+        data (str): The string to encode in the QR code.
+    """
+    qr = qrcode.QRCode(border=1)
+    qr.add_data(data)
+    qr.make(fit=True)
+    qr.print_ascii(out=sys.stdout, tty=sys.stdout.isatty())
+
+
+def display_qr_code(data: str) -> Optional["Image"]:
     """
     Generate and display a QR code for the given data.
 
@@ -67,18 +115,22 @@ def print_totp_codes(secret: str) -> None:
     """
     Continuously compute and print the current TOTP code whenever it changes.
 
+    Codes only change at multiples of the TOTP interval, so instead of polling this sleeps until
+    the next boundary and prints the code for exactly that timestamp.
+
     Args:
         secret (str): The shared secret key for TOTP generation.
     """
-    totp = pyotp.TOTP(secret)
-    previous_code = ""
+    interval = get_totp(secret).interval
     try:
+        now = time.time()
+        print(f"TOTP code: {code_for(secret, int(now) // interval)}")
+        boundary = int(now) // interval * interval
         while True:
-            current_code = totp.now()
-            if current_code != previous_code:
-                print(f"TOTP code: {current_code}")
-                previous_code = current_code
-            time.sleep(1)
+            # Normally the next boundary; after a suspend, the first one still ahead.
+            boundary = max(boundary + interval, (int(time.time()) // interval + 1) * interval)
+            time.sleep(max(0.0, boundary - time.time()))
+            print(f"TOTP code: {code_for(secret, boundary // interval)}")
     except KeyboardInterrupt:
         print("\nExiting.")
 
@@ -103,6 +155,11 @@ def main() -> None:
         default="MyService",
         help="Issuer name for provisioning (e.g., your service)."
     )
+    parser.add_argument(
+        "--image",
+        action="store_true",
+        help="Open the QR code in an image viewer instead of printing it to the terminal."
+    )
     args = parser.parse_args()
 
     # 1. Generate shared secret
@@ -113,7 +170,10 @@ def main() -> None:
     uri = create_provisioning_uri(secret, args.account_name, args.issuer_name)
     print(f"Provisioning URI: {uri}")
     print("Displaying QR code. Scan it with your authenticator app.")
-    display_qr_code(uri)
+    if args.image:
+        display_qr_code(uri)
+    else:
+        print_qr_code(uri)
 
     # 3. Print TOTP codes as they update
     print_totp_codes(secret)
@@ -8,18 +8,21 @@ Includes HTML-formatted descriptions with live links, attendees, and timezone su
 
 Setting up the environment:
 
-    pip install icalendar python-dateutil pytz PyQt5
+    pip install icalendar python-dateutil PyQt5
+
+On Windows, also install tzdata so that zoneinfo has a time zone database.
 """
 
 import os
 import argparse
+import functools
 import html
 import re
-from typing import Optional
-from datetime import datetime
+from typing import List, NamedTuple, Optional
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo, available_timezones
 from icalendar import Calendar, Event, vCalAddress
 from dateutil.rrule import rrulestr
-import pytz
 
 # Qt imports
 from PyQt5.QtWidgets import (
@@ -29,6 +32,26 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QTextBrowser
 
+# Time zone names for the GUI selector, sorted once rather than on every widget construction
+_SORTED_TZS = sorted(available_timezones())
+
+# Link patterns used by format_description, compiled once rather than looked up on every call
+_ANGLE_LINK_RE = re.compile(r"([^\n<]{1,100})<((https?|ftp)://[^>]+)>")
+_BARE_LINK_RE = re.compile(r"(?<!href=\")(?<!\">)(https?://[^\s<>\"]+)")
+
+
+class EventRecord(NamedTuple):
+    """The fields of one VEVENT that the summaries use, extracted once at load time."""
+    uid: str
+    summary: str
+    dtstart: Optional[date]
+    dtend: Optional[date]
+    rrule: str
+    recurrence_id: Optional[date]
+    status: str
+    description_raw: str
+    attendees: List[str]
+
 
 def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Summarize an ICS file")
@@ -41,12 +64,27 @@ def decode_bytes(value) -> str:
     return value.decode("utf-8") if isinstance(value, bytes) else str(value)
 
 
-def format_datetime(dt: datetime, local_tz: Optional[pytz.timezone]) -> str:
+@functools.lru_cache(maxsize=4096)
+def _format_in_zone(dt: datetime, fold: int, local_tz: ZoneInfo) -> str:
+    # Aware datetimes compare equal when they are the same instant, and the converted text depends
+    # only on the instant, so repeated start/end times are formatted once per zone. Within one zone
+    # equality ignores fold, so fold is part of the key to keep ambiguous wall times apart.
+    return dt.astimezone(local_tz).strftime("%Y-%m-%d %H:%M:%S %Z")
+
+
+def format_datetime(dt: datetime, local_tz: Optional[ZoneInfo]) -> str:
     if local_tz:
         if dt.tzinfo is None:
-            dt = local_tz.localize(dt)
-        else:
-            dt = dt.astimezone(local_tz)
+            # Read ambiguous or skipped wall times as standard time, like pytz's
+            # localize(is_dst=False) did: take whichever fold has no DST offset.
+            dt = dt.replace(tzinfo=local_tz)
+            if dt.dst():
+                other = dt.replace(fold=1 - dt.fold)
+                if not other.dst():
+                    dt = other
+        return _format_in_zone(dt, dt.fold, local_tz)
+    # Without a target zone the text depends on the datetime's own zone, which equal
+    # (same instant) datetimes do not share, so this path is not cached.
     return dt.strftime("%Y-%m-%d %H:%M:%S %Z")
 
 
@@ -77,33 +115,57 @@ def format_description(description_raw: str) -> str:
         url = match.group(2).strip()
         return f'{html.escape(label)}: <a href="{html.escape(url)}">{html.escape(url)}</a>'
 
-    text = re.sub(r"([^\n<]{1,100})<((https?|ftp)://[^>]+)>", angle_replacer, text)
+    text = _ANGLE_LINK_RE.sub(angle_replacer, text)
 
     # Convert standalone links into clickable HTML links
-    text = re.sub(r"(?<!href=\")(?<!\">)(https?://[^\s<>\"]+)",
-                  lambda m: f'<a href="{m.group(1)}">{m.group(1)}</a>',
-                  text)
+    text = _BARE_LINK_RE.sub(lambda m: f'<a href="{m.group(1)}">{m.group(1)}</a>', text)
 
     # Convert remaining plain text to safe HTML (preserving links)
-    lines = text.splitlines()
-    html_lines = []
-    for line in lines:
-        html_lines.append(line)
-
-    return "<br>".join(html_lines)
+    return "<br>".join(text.splitlines())
 
 
 
-def summarize_event(event: Event, local_tz: Optional[pytz.timezone], html_output: bool = False) -> str:
-    uid = decode_bytes(event.get("UID"))
-    summary = decode_bytes(event.get("SUMMARY", "No Summary"))
+def extract_event_record(event: Event) -> EventRecord:
     dtstart = event.get("DTSTART")
     dtend = event.get("DTEND")
-    rrule = decode_bytes(event.get("RRULE", ""))
     recurrence_id = event.get("RECURRENCE-ID")
-    status = decode_bytes(event.get("STATUS", ""))
-    description_raw = decode_bytes(event.get("DESCRIPTION", ""))
-    attendees = extract_attendees(event)
+    # Keep the rule in its iCalendar text form (FREQ=...;...), which is what rrulestr parses
+    rrule = event.get("RRULE")
+    return EventRecord(
+        uid=decode_bytes(event.get("UID")),
+        summary=decode_bytes(event.get("SUMMARY", "No Summary")),
+        dtstart=dtstart.dt if dtstart else None,
+        dtend=dtend.dt if dtend else None,
+        rrule=rrule.to_ical().decode("utf-8") if rrule else "",
+        recurrence_id=recurrence_id.dt if recurrence_id else None,
+        status=decode_bytes(event.get("STATUS", "")),
+        description_raw=decode_bytes(event.get("DESCRIPTION", "")),
+        attendees=extract_attendees(event),
+    )
+
+
+def load_ics(path: str) -> List[EventRecord]:
+    """Parse an .ics file and extract the fields of every VEVENT in it.
+
+    icalendar only parses complete strings, so the file is decoded while it is read (the same way
+    icalendar decodes bytes) and no raw bytes copy is kept alive alongside the text during parsing.
+    """
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        cal = Calendar.from_ical(f.read())
+    return [extract_event_record(component) for component in cal.walk() if component.name == "VEVENT"]
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_rrule(rrule: str, dtstart: Optional[date]):
+    # Occurrences of a recurring series repeat the same rule text and start, so each is parsed once.
+    return rrulestr(rrule, dtstart=dtstart)
+
+
+def summarize_event(record: EventRecord, local_tz: Optional[ZoneInfo], html_output: bool = False,
+                    now: Optional[datetime] = None) -> str:
+    uid, summary, dtstart, dtend, rrule, recurrence_id, status, description_raw, attendees = record
+    if now is None:
+        now = datetime.now(timezone.utc)
 
     event_type = "NEW"
     if recurrence_id:
@@ -118,16 +180,16 @@ def summarize_event(event: Event, local_tz: Optional[pytz.timezone], html_output
         lines.append(f"<b>Type:</b> {event_type}<br>")
         lines.append(f"<b>UID:</b> {html.escape(uid)}<br>")
         if recurrence_id:
-            lines.append(f"<b>Change to occurrence:</b> {format_datetime(recurrence_id.dt, local_tz)}<br>")
+            lines.append(f"<b>Change to occurrence:</b> {format_datetime(recurrence_id, local_tz)}<br>")
         if dtstart:
-            lines.append(f"<b>Starts:</b> {format_datetime(dtstart.dt, local_tz)}<br>")
+            lines.append(f"<b>Starts:</b> {format_datetime(dtstart, local_tz)}<br>")
         if dtend:
-            lines.append(f"<b>Ends:</b> {format_datetime(dtend.dt, local_tz)}<br>")
+            lines.append(f"<b>Ends:</b> {format_datetime(dtend, local_tz)}<br>")
         if rrule:
             lines.append(f"<b>Recurs:</b> {html.escape(rrule)}<br>")
             try:
-                rule = rrulestr(rrule, dtstart=dtstart.dt)
-                next_occ = rule.after(datetime.now(pytz.utc))
+                rule = _parse_rrule(rrule, dtstart)
+                next_occ = rule.after(now)
                 lines.append(f"<b>Next Occurrence:</b> {format_datetime(next_occ, local_tz)}<br>")
             except Exception as e:
                 lines.append(f"<b>Recurrence Error:</b> {html.escape(str(e))}<br>")
@@ -146,16 +208,16 @@ def summarize_event(event: Event, local_tz: Optional[pytz.timezone], html_output
         lines.append(f"   ➤ Type: {event_type}")
         lines.append(f"   ➤ Summary: {summary}")
         if recurrence_id:
-            lines.append(f"   ➤ Change to occurrence on: {format_datetime(recurrence_id.dt, local_tz)}")
+            lines.append(f"   ➤ Change to occurrence on: {format_datetime(recurrence_id, local_tz)}")
         if dtstart:
-            lines.append(f"   ➤ Starts: {format_datetime(dtstart.dt, local_tz)}")
+            lines.append(f"   ➤ Starts: {format_datetime(dtstart, local_tz)}")
         if dtend:
-            lines.append(f"   ➤ Ends:   {format_datetime(dtend.dt, local_tz)}")
+            lines.append(f"   ➤ Ends:   {format_datetime(dtend, local_tz)}")
         if rrule:
             lines.append(f"   ➤ Recurs: {rrule}")
             try:
-                rule = rrulestr(rrule, dtstart=dtstart.dt)
-                next_occ = rule.after(datetime.now(pytz.utc))
+                rule = _parse_rrule(rrule, dtstart)
+                next_occ = rule.after(now)
                 lines.append(f"   ➤ Next Occurrence: {format_datetime(next_occ, local_tz)}")
             except Exception as e:
                 lines.append(f"   ➤ Recurrence parse error: {e}")
@@ -168,28 +230,34 @@ def summarize_event(event: Event, local_tz: Optional[pytz.timezone], html_output
         return "\n".join(lines)
 
 
-def summarize_ics_file(path: str, tz_name: Optional[str], html_output: bool = False) -> str:
-    if not os.path.exists(path):
+def render_events(records: List[EventRecord], local_tz: Optional[ZoneInfo], html_output: bool = False) -> str:
+    now = datetime.now(timezone.utc)  # One reference time for the whole render pass
+    return "\n".join(summarize_event(record, local_tz, html_output=html_output, now=now) for record in records)
+
+
+def summarize_ics_file(path: str, tz_name: Optional[str], html_output: bool = False,
+                       records: Optional[List[EventRecord]] = None) -> str:
+    """Summarize an .ics file, reusing already loaded records instead of re-parsing when given."""
+    if records is None and not os.path.exists(path):
         return f"<b>❌ File not found:</b> {path}" if html_output else f"❌ File not found: {path}"
 
     local_tz = None
     if tz_name:
         try:
-            local_tz = pytz.timezone(tz_name)
+            local_tz = ZoneInfo(tz_name)
         except Exception:
             return f"<b>❌ Invalid time zone:</b> {tz_name}" if html_output else f"❌ Invalid time zone: {tz_name}"
 
-    with open(path, "rb") as f:
-        cal = Calendar.from_ical(f.read())
+    if records is None:
+        records = load_ics(path)
 
     output = []
     output.append(f"<h2>📅 {html.escape(os.path.basename(path))}</h2>") if html_output else output.append(f"\n📅 Parsing ICS file: {path}")
     if local_tz:
-        output.append(f"<p><b>Time zone:</b> {local_tz.zone}</p>") if html_output else output.append(f"🕑 Converting times to: {local_tz.zone}")
+        output.append(f"<p><b>Time zone:</b> {local_tz.key}</p>") if html_output else output.append(f"🕑 Converting times to: {local_tz.key}")
 
-    for component in cal.walk():
-        if component.name == "VEVENT":
-            output.append(summarize_event(component, local_tz, html_output=html_output))
+    if records:
+        output.append(render_events(records, local_tz, html_output=html_output))
 
     return "\n".join(output)
 
@@ -205,6 +273,7 @@ class ICSDropper(QWidget):
 
         self.layout = QVBoxLayout()
         self.last_path = None  # NEW: store the last file path
+        self.cached_records = None  # Parsed events of last_path, re-rendered on time zone changes
 
         self.label = QLabel("📂 Drop an .ics file here")
         self.label.setAlignment(Qt.AlignCenter)
@@ -212,7 +281,7 @@ class ICSDropper(QWidget):
         self.layout.addWidget(self.label)
 
         self.timezone_combo = QComboBox()
-        self.timezone_combo.addItems(sorted(pytz.all_timezones))
+        self.timezone_combo.addItems(_SORTED_TZS)
         self.timezone_combo.setCurrentText("UTC")
         self.timezone_combo.currentTextChanged.connect(self.reapply_timezone)  # NEW: connect to update
         self.layout.addWidget(self.timezone_combo)
@@ -228,7 +297,8 @@ class ICSDropper(QWidget):
     def reapply_timezone(self, new_tz: str):
         """Re-render the current ICS file with the newly selected time zone."""
         if self.last_path:
-            result = summarize_ics_file(self.last_path, tz_name=new_tz, html_output=True)
+            result = summarize_ics_file(self.last_path, tz_name=new_tz, html_output=True,
+                                        records=self.cached_records)
             self.output_box.setHtml(result)
 
 
@@ -243,8 +313,9 @@ class ICSDropper(QWidget):
             path = url.toLocalFile()
             if path.endswith(".ics"):
                 self.last_path = path  # NEW: store path
+                self.cached_records = load_ics(path) if os.path.exists(path) else None
                 tz = self.timezone_combo.currentText()
-                result = summarize_ics_file(path, tz_name=tz, html_output=True)
+                result = summarize_ics_file(path, tz_name=tz, html_output=True, records=self.cached_records)
                 self.output_box.setHtml(result)
 
 # ───────────────────────────────────────────── Entry Point ───────────────────────────────────────────── #